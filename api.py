@@ -1,14 +1,51 @@
-import json
-from fastapi import FastAPI, HTTPException
+import threading
+import time
+from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
 
 # Import your existing search logic
-from vector_engine import collection, get_recommendations
+from vector_engine import collection, retrieve_assessments, explain_recommendations, upsert_listeners, CHROMA_HOST
+from suggest_index import SuggestIndex
 
 app = FastAPI(title="SHL Assessment Recommender API")
 
+# Typeahead index lives in memory; lookups never touch Chroma
+SUGGEST_REFRESH_SECONDS = 30
+suggest_index = SuggestIndex()
+
+def refresh_suggest_index():
+    """Indexes stored assessments the suggest index hasn't seen yet"""
+    # Chroma returns rows in insertion order, so only rows past those already indexed are fetched
+    stored = collection.get(offset=len(suggest_index), include=["metadatas"])
+    suggest_index.add(stored['metadatas'] or [], stored['ids'])
+
+    if collection.count() != len(suggest_index):
+        # Rows were deleted, so offsets no longer line up; fetch just the unseen ids
+        new_ids = [doc_id for doc_id in collection.get(include=[])['ids'] if doc_id not in suggest_index]
+        if new_ids:
+            stored = collection.get(ids=new_ids, include=["metadatas"])
+            suggest_index.add(stored['metadatas'] or [], stored['ids'])
+
+def suggest_refresh_loop():
+    # Picks up assessments upserted by other processes (pipeline.py, ingest_data)
+    while True:
+        time.sleep(SUGGEST_REFRESH_SECONDS)
+        try:
+            if collection.count() != len(suggest_index):
+                refresh_suggest_index()
+        except Exception as e:
+            print(f"Suggest index refresh failed: {e}")
+
+refresh_suggest_index()
+# Upserts made in this process reach /suggest immediately
+upsert_listeners.append(suggest_index.add)
+# Other processes' upserts are only retrievable through a shared Chroma server, so
+# /suggest follows them only then and never offers what /recommend can't return
+if CHROMA_HOST:
+    threading.Thread(target=suggest_refresh_loop, daemon=True).start()
+
 # --- PDF Requirement: Models for JSON Validation ---
 class QueryRequest(BaseModel):
     query: str
@@ -25,43 +62,58 @@ class AssessmentResponse(BaseModel):
 class RecommendationResponse(BaseModel):
     recommended_assessments: List[AssessmentResponse]
 
+class ExplanationRequest(BaseModel):
+    query: str
+    assessments: Optional[List[AssessmentResponse]] = None
+
+class ExplanationResponse(BaseModel):
+    explanation: str
+
+class Suggestion(BaseModel):
+    text: str
+    type: str
+    url: Optional[str] = None
+
+class SuggestResponse(BaseModel):
+    suggestions: List[Suggestion]
+
 # --- 1. Health Check Endpoint [cite: 155, 161] ---
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
 # --- 2. Recommendation Endpoint [cite: 163, 167] ---
+# Plain `def` endpoints run in FastAPI's threadpool, so blocking Chroma/Gemini
+# calls from one client don't stall every other connection
 @app.post("/recommend", response_model=RecommendationResponse)
-async def recommend(request: QueryRequest):
+def recommend(request: QueryRequest):
     try:
         # Perform vector search (requesting top 10 as per PDF) [cite: 163]
-        results = collection.query(
-            query_texts=[request.query],
-            n_results=10
-        )
-        
-        if not results['metadatas'] or not results['metadatas'][0]:
-            return {"recommended_assessments": []}
-
-        formatted_results = []
-        for item in results['metadatas'][0]:
-            # Convert the stored JSON string back into a Python List
-            t_type = json.loads(item['test_type']) if isinstance(item['test_type'], str) else item['test_type']
-            
-            formatted_results.append({
-                "url": item['url'],
-                "name": item['name'],
-                "adaptive_support": item['adaptive_support'],
-                "description": item['description'],
-                "duration": int(item['duration']),
-                "remote_support": item['remote_support'],
-                "test_type": t_type
-            })
+        formatted_results = retrieve_assessments(request.query, n_results=10)
+
+        for item in formatted_results:
+            suggest_index.record_hit(item['name'])
 
         return {"recommended_assessments": formatted_results}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# --- Explanation Endpoint (fetched separately so results render first) ---
+@app.post("/explain", response_model=ExplanationResponse)
+def explain(request: ExplanationRequest):
+    try:
+        # Reuse the client's retrieved table when given, otherwise search again
+        items = [a.model_dump() for a in request.assessments] if request.assessments is not None else retrieve_assessments(request.query, n_results=10)
+        return {"explanation": explain_recommendations(request.query, items)}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+# --- Typeahead Endpoint ---
+@app.get("/suggest", response_model=SuggestResponse)
+def suggest(q: str = Query(..., min_length=1), limit: int = Query(8, ge=1, le=25)):
+    return {"suggestions": suggest_index.suggest(q, limit=limit)}
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
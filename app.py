@@ -1,6 +1,13 @@
+import os
 import streamlit as st
-import time
-from vector_engine import get_recommendations
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+# Set SHL_API_URL (e.g. http://localhost:8000) to run against the FastAPI service;
+# otherwise the engine is loaded in-process
+API_URL = os.getenv("SHL_API_URL")
+PAGE_SIZE = 5
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -70,6 +77,47 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# --- Backend Resources (shared by all sessions) ---
+@st.cache_resource
+def get_http_session():
+    """Keep-alive HTTP client with a connection pool to the API"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=20, max_retries=2)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def load_engine():
+    """Imported lazily so API mode never loads Chroma; the module (and its client) is shared process-wide"""
+    import vector_engine
+    return vector_engine
+
+def fetch_assessments(query):
+    if API_URL:
+        response = get_http_session().post(f"{API_URL}/recommend", json={"query": query}, timeout=30)
+        response.raise_for_status()
+        return response.json()["recommended_assessments"]
+    return load_engine().retrieve_assessments(query, n_results=10)
+
+def fetch_explanation(query, assessments):
+    if API_URL:
+        response = get_http_session().post(
+            f"{API_URL}/explain",
+            json={"query": query, "assessments": assessments},
+            timeout=60
+        )
+        response.raise_for_status()
+        return response.json()["explanation"]
+    return load_engine().explain_recommendations(query, assessments)
+
+# --- Per-Session Result Cache ---
+if "results" not in st.session_state:
+    st.session_state.results = {}
+if "active_query" not in st.session_state:
+    st.session_state.active_query = None
+if "page" not in st.session_state:
+    st.session_state.page = 0
+
 # --- Header Section ---
 st.title("SHL Smart Assessment Recommender")
 st.markdown("Enter a job role or skill requirement below, and our AI will recommend the best assessments from the SHL catalog.")
@@ -80,24 +128,75 @@ query = st.text_input("What role are you hiring for?", placeholder="e.g., Senior
 # --- Logic ---
 if st.button("Find Assessments"):
     if query:
-        with st.spinner(" Searching catalog and generating AI insights..."):
-            # Call the backend function we built
-            try:
-                result = get_recommendations(query)
-                
-                # Display Results
-                st.subheader(" AI Recommendation")
-                st.markdown(f"""
-                <div class="recommendation-box">
-                    {result.replace(chr(10), '<br>')}
-                </div>
-                """, unsafe_allow_html=True)
-                
-            except Exception as e:
-                st.error(f"An error occurred: {e}")
+        st.session_state.active_query = query.strip()
+        st.session_state.page = 0
     else:
         st.warning("Please enter a job role to search.")
 
+# Render from session state so paging reruns don't trigger a new search
+active_query = st.session_state.active_query
+if active_query:
+    cached = st.session_state.results.setdefault(active_query, {})
+
+    try:
+        # 1. Retrieval only, so the table shows before the LLM finishes
+        if "assessments" not in cached:
+            with st.spinner(" Searching catalog..."):
+                cached["assessments"] = fetch_assessments(active_query)
+        assessments = cached["assessments"]
+
+        st.subheader(" Recommended Assessments")
+        if assessments:
+            total_pages = (len(assessments) - 1) // PAGE_SIZE + 1
+            page = min(st.session_state.page, total_pages - 1)
+            rows = assessments[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+
+            table = pd.DataFrame([{
+                "Assessment": item["name"],
+                "URL": item["url"],
+                "Test Type": ", ".join(item["test_type"]),
+                "Duration (min)": item["duration"],
+                "Remote": item["remote_support"],
+                "Adaptive": item["adaptive_support"]
+            } for item in rows])
+            st.dataframe(
+                table,
+                hide_index=True,
+                use_container_width=True,
+                column_config={"URL": st.column_config.LinkColumn("URL")}
+            )
+
+            if total_pages > 1:
+                prev_col, info_col, next_col = st.columns([1, 2, 1])
+                if prev_col.button("Previous", disabled=page == 0):
+                    st.session_state.page = page - 1
+                    st.rerun()
+                info_col.caption(f"Page {page + 1} of {total_pages} ({len(assessments)} assessments)")
+                if next_col.button("Next", disabled=page >= total_pages - 1):
+                    st.session_state.page = page + 1
+                    st.rerun()
+        else:
+            st.info("No relevant assessments found.")
+
+        # 2. Explanation is a separate call and cached with the results
+        if assessments:
+            if "explanation" not in cached:
+                with st.spinner(" Generating AI insights..."):
+                    cached["explanation"] = fetch_explanation(active_query, assessments)
+
+            # Display Results
+            st.subheader(" AI Recommendation")
+            st.markdown(f"""
+            <div class="recommendation-box">
+                {cached["explanation"].replace(chr(10), '<br>')}
+            </div>
+            """, unsafe_allow_html=True)
+
+    except Exception as e:
+        # Drop the partial entry so the next attempt retries
+        st.session_state.results.pop(active_query, None)
+        st.error(f"An error occurred: {e}")
+
 # --- Footer ---
 st.markdown("---")
 st.caption("Powered by Google Gemini & ChromaDB | Developed by Abhinav Jain MTech (AI), IIIT Vadodara | 2025")
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Local stand-in for the Gemini REST API used by vector_engine.
+
+Serves embedContent, batchEmbedContents and generateContent with configurable
+latency and error rate, so benchmarks run without Google credentials.
+
+Run: python -m benchmarks.fake_gemini --port 8765 --latency-ms 20 --error-rate 0.01
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EMBEDDING_DIM = 768  # Matches text-embedding-004 and the zero-vector fallback
+
+def fake_embedding(text):
+    """Deterministic hashed bag-of-words vector, so similar texts stay close"""
+    vector = [0.0] * EMBEDDING_DIM
+    for word in re.findall(r'\w+', text.lower()):
+        digest = hashlib.md5(word.encode('utf-8')).digest()
+        index = int.from_bytes(digest[:4], 'little') % EMBEDDING_DIM
+        vector[index] += 1.0 if digest[4] % 2 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+def content_text(content):
+    return " ".join(part.get('text', '') for part in content.get('parts', []))
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    stats = {'requests': 0, 'errors': 0}
+    stats_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith("/stats"):
+            with self.stats_lock:
+                self._send_json(200, dict(self.stats))
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": "Not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        path = self.path.split('?')[0]
+
+        with self.stats_lock:
+            self.stats['requests'] += 1
+
+        time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+        if random.random() < self.error_rate:
+            with self.stats_lock:
+                self.stats['errors'] += 1
+            self._send_json(500, {"error": {"code": 500, "message": "Injected failure", "status": "INTERNAL"}})
+            return
+
+        if path.endswith(":batchEmbedContents"):
+            embeddings = [{"values": fake_embedding(content_text(r.get('content', {})))} for r in request.get('requests', [])]
+            self._send_json(200, {"embeddings": embeddings})
+        elif path.endswith(":embedContent"):
+            self._send_json(200, {"embedding": {"values": fake_embedding(content_text(request.get('content', {})))}})
+        elif path.endswith(":generateContent"):
+            prompt = " ".join(content_text(c) for c in request.get('contents', []))
+            text = f"These assessments match the query ({len(prompt)} characters of context)."
+            self._send_json(200, {
+                "candidates": [{
+                    "content": {"parts": [{"text": text}], "role": "model"},
+                    "finishReason": "STOP",
+                    "index": 0
+                }]
+            })
+        else:
+            self._send_json(404, {"error": {"code": 404, "message": f"Unknown method {path}", "status": "NOT_FOUND"}})
+
+def run_server(port=8765, latency_ms=20.0, jitter_ms=5.0, error_rate=0.0):
+    FakeGeminiHandler.latency = latency_ms / 1000.0
+    FakeGeminiHandler.jitter = jitter_ms / 1000.0
+    FakeGeminiHandler.error_rate = error_rate
+    server = ThreadingHTTPServer(("127.0.0.1", port), FakeGeminiHandler)
+    server.daemon_threads = True
+    print(f"Fake Gemini listening on http://127.0.0.1:{port} (latency {latency_ms}ms, error rate {error_rate})", flush=True)
+    server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Gemini API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    run_server(args.port, args.latency_ms, args.jitter_ms, args.error_rate)
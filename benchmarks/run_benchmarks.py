@@ -0,0 +1,332 @@
+"""
+End-to-end performance benchmarks against a local Gemini stand-in.
+
+For each synthetic catalog size a fresh worker process measures engine import,
+ingest throughput, API import, /recommend and /explain latency percentiles
+under concurrency, batch prediction time and peak memory. Each phase also
+reports how many Gemini results fell back (zero vectors, placeholder
+explanations), since the engine absorbs failures and endpoints still return 200. Results are written as JSON so runs
+can be compared to catch regressions.
+
+Run:     python -m benchmarks.run_benchmarks --sizes 400 10000 100000
+Compare: python -m benchmarks.run_benchmarks --sizes 400 --compare benchmarks/results/<old>.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FOLDER = os.path.join(REPO_ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [400, 10000, 100000]
+
+# Metrics checked by --compare, by which direction counts as a regression
+LOWER_IS_BETTER = {
+    "engine_import_s", "ingest_s", "api_import_s",
+    "recommend_p50_ms", "recommend_p90_ms", "recommend_p99_ms",
+    "explain_p50_ms", "explain_p90_ms", "explain_p99_ms",
+    "predictions_s", "peak_rss_mb"
+}
+HIGHER_IS_BETTER = {"ingest_docs_per_s", "recommend_rps", "explain_rps"}
+# Rates are compared by absolute difference, since their baseline is usually 0.
+# HTTP errors alone miss Gemini failures the engine absorbs, hence the degraded rates
+RATE_METRICS = {
+    "recommend_error_rate", "explain_error_rate",
+    "ingest_degraded_rate", "recommend_degraded_rate", "explain_degraded_rate", "predictions_degraded_rate"
+}
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout}s")
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+# --- Worker: runs inside a fresh process per catalog size ---
+
+def degradation_snapshot():
+    """Engine fallback counters plus the fake server's own request/error counts"""
+    import vector_engine
+    return dict(vector_engine.fallback_stats), fake_server_stats(os.environ["GEMINI_API_ENDPOINT"]) or {}
+
+def phase_degradation(name, before, after, gemini_results):
+    """
+    Per-phase Gemini failures. `gemini_results` is how many embeddings/explanations the
+    phase needed; the degraded rate is the fraction of them that fell back.
+    """
+    (engine_before, server_before), (engine_after, server_after) = before, after
+    zero_embeddings = engine_after.get("zero_embeddings", 0) - engine_before.get("zero_embeddings", 0)
+    unavailable = engine_after.get("unavailable_explanations", 0) - engine_before.get("unavailable_explanations", 0)
+    return {
+        f"{name}_gemini_requests": server_after.get("requests", 0) - server_before.get("requests", 0),
+        f"{name}_gemini_errors": server_after.get("errors", 0) - server_before.get("errors", 0),
+        f"{name}_zero_embeddings": zero_embeddings,
+        f"{name}_unavailable_explanations": unavailable,
+        f"{name}_degraded_rate": (zero_embeddings + unavailable) / gemini_results if gemini_results else 0.0
+    }
+
+def measure_endpoint(url, name, queries, concurrency, total_requests):
+    """Fires `total_requests` POSTs at /<name> from `concurrency` clients; metrics are prefixed with `name`"""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_maxsize=concurrency))
+
+    def one_request(i):
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{url}/{name}", json={"query": queries[i % len(queries)]}, timeout=120)
+            ok = response.status_code == 200
+        except Exception:
+            ok = False
+        return (time.perf_counter() - start) * 1000, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one_request, range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(ms for ms, ok in samples if ok)
+    errors = total_requests - len(latencies)
+    return {
+        f"{name}_requests": total_requests,
+        f"{name}_concurrency": concurrency,
+        f"{name}_p50_ms": percentile(latencies, 50),
+        f"{name}_p90_ms": percentile(latencies, 90),
+        f"{name}_p99_ms": percentile(latencies, 99),
+        # Only successful requests count towards throughput
+        f"{name}_rps": len(latencies) / elapsed if elapsed else None,
+        f"{name}_error_rate": errors / total_requests if total_requests else 0.0
+    }
+
+def run_worker(args):
+    """Measures one catalog size; the parent sets CHROMA_PATH and GEMINI_API_ENDPOINT"""
+    import uvicorn
+    from benchmarks.synthetic_catalog import generate_catalog
+
+    result = {"size": args.size}
+
+    # 1. Cold engine import (Gemini config + Chroma client), then ingest throughput
+    # (batched upsert, as used by pipeline.py)
+    catalog = generate_catalog(args.size, seed=args.seed)
+    start = time.perf_counter()
+    import vector_engine
+    result["engine_import_s"] = time.perf_counter() - start
+
+    before = degradation_snapshot()
+    start = time.perf_counter()
+    for i in range(0, len(catalog), args.batch_size):
+        vector_engine.upsert_assessments(catalog[i:i + args.batch_size])
+    result["ingest_s"] = time.perf_counter() - start
+    result.update(phase_degradation("ingest", before, degradation_snapshot(), args.size))
+    result["ingest_docs_per_s"] = args.size / result["ingest_s"] if result["ingest_s"] else None
+    del catalog
+
+    # 2. API import on top of the loaded engine (FastAPI + /suggest index build),
+    # then /recommend (embedding only) and /explain (embedding + generation) latency
+    start = time.perf_counter()
+    import api
+    result["api_import_s"] = time.perf_counter() - start
+
+    from generate_predictions import test_queries
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning"))
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    wait_for_port(port)
+
+    before = degradation_snapshot()
+    result.update(measure_endpoint(f"http://127.0.0.1:{port}", "recommend", test_queries, args.concurrency, args.requests))
+    # One query embedding per request
+    result.update(phase_degradation("recommend", before, degradation_snapshot(), args.requests))
+
+    before = degradation_snapshot()
+    result.update(measure_endpoint(f"http://127.0.0.1:{port}", "explain", test_queries, args.concurrency, args.explain_requests))
+    # One query embedding and one generated explanation per request
+    result.update(phase_degradation("explain", before, degradation_snapshot(), 2 * args.explain_requests))
+    server.should_exit = True
+    server_thread.join(timeout=10)
+
+    # 3. Batch prediction time (writes predictions.csv into the worker's temp folder)
+    import generate_predictions
+    before = degradation_snapshot()
+    start = time.perf_counter()
+    generate_predictions.generate_csv()
+    result["predictions_s"] = time.perf_counter() - start
+    result.update(phase_degradation("predictions", before, degradation_snapshot(), len(generate_predictions.test_queries)))
+
+    # 4. Peak memory of the whole worker process
+    result["peak_rss_mb"] = peak_rss_mb()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=4)
+
+# --- Orchestrator ---
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except Exception:
+        return None
+
+def fake_server_stats(base_url):
+    import requests
+    try:
+        return requests.get(f"{base_url}/stats", timeout=5).json()
+    except Exception:
+        return None
+
+def run_size(size, args, gemini_port):
+    with tempfile.TemporaryDirectory(prefix=f"shl_bench_{size}_") as workdir:
+        output = os.path.join(workdir, "result.json")
+        env = dict(os.environ)
+        env.update({
+            "PYTHONPATH": REPO_ROOT + os.pathsep + env.get("PYTHONPATH", ""),
+            "GOOGLE_API_KEY": "benchmark-fake-key",
+            "GEMINI_API_ENDPOINT": f"http://127.0.0.1:{gemini_port}",
+            "CHROMA_PATH": os.path.join(workdir, "chroma_db"),
+        })
+        command = [
+            sys.executable, "-m", "benchmarks.run_benchmarks", "--worker",
+            "--size", str(size), "--output", output,
+            "--seed", str(args.seed), "--batch-size", str(args.batch_size),
+            "--concurrency", str(args.concurrency), "--requests", str(args.requests),
+            "--explain-requests", str(args.explain_requests)
+        ]
+        # Run from the temp folder so predictions.csv and data/ never touch the repo
+        subprocess.run(command, cwd=workdir, env=env, check=True)
+        with open(output, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+def compare(current, baseline, threshold, rate_threshold):
+    """Prints metric deltas against a previous run and returns the regressions"""
+    regressions = []
+    old_by_size = {r["size"]: r for r in baseline.get("results", [])}
+    for result in current["results"]:
+        old = old_by_size.get(result["size"])
+        if not old:
+            continue
+        print(f"\n--- Size {result['size']} vs {baseline.get('git_commit')} ---")
+        for metric, value in result.items():
+            old_value = old.get(metric)
+            if metric not in LOWER_IS_BETTER | HIGHER_IS_BETTER | RATE_METRICS or value is None or old_value is None:
+                continue
+            if metric in RATE_METRICS:
+                delta = value - old_value
+                worse = delta > rate_threshold
+                change_text = f"{delta * 100:+.1f} pts"
+                limit_text = f"more than {rate_threshold * 100:.1f} pts"
+            else:
+                change = (value - old_value) / old_value if old_value else (float("inf") if value else 0.0)
+                worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+                change_text = f"{change:+.1%}"
+                limit_text = f"more than {threshold:.0%}"
+            flag = "  REGRESSION" if worse else ""
+            print(f"{metric:>24}: {old_value:12.3f} -> {value:12.3f} ({change_text}){flag}")
+            if worse:
+                regressions.append((result["size"], metric, change_text, limit_text))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end performance benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Synthetic catalog sizes")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Fake Gemini latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of fake Gemini requests that fail")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent /recommend clients")
+    parser.add_argument("--requests", type=int, default=200, help="Total /recommend requests per size")
+    parser.add_argument("--explain-requests", type=int, default=50, help="Total /explain requests per size")
+    parser.add_argument("--batch-size", type=int, default=64, help="Assessments per upsert batch")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change flagged as a regression")
+    parser.add_argument("--rate-threshold", type=float, default=0.01, help="Absolute increase in an error or degraded rate flagged as a regression")
+    # Internal: a single-size measurement in a fresh process
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    gemini_port = free_port()
+    gemini = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fake_gemini", "--port", str(gemini_port),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate)
+    ], cwd=REPO_ROOT)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+            "concurrency": args.concurrency, "requests": args.requests, "explain_requests": args.explain_requests,
+            "batch_size": args.batch_size, "seed": args.seed
+        },
+        "results": []
+    }
+
+    try:
+        wait_for_port(gemini_port)
+        for size in args.sizes:
+            print(f"\n{'='*60}\nBENCHMARKING {size} ASSESSMENTS\n{'='*60}", flush=True)
+            result = run_size(size, args, gemini_port)
+            print(json.dumps(result, indent=4))
+            report["results"].append(result)
+        report["fake_gemini"] = fake_server_stats(f"http://127.0.0.1:{gemini_port}")
+    finally:
+        gemini.terminate()
+        gemini.wait()
+
+    os.makedirs(RESULTS_FOLDER, exist_ok=True)
+    output_file = os.path.join(RESULTS_FOLDER, f"bench_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=4)
+    print(f"\nSaved results to {output_file}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.rate_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed:")
+            for size, metric, change_text, limit_text in regressions:
+                print(f"  size {size}: {metric} changed {change_text} (limit: {limit_text})")
+            sys.exit(1)
+        print("\nNo regressions detected.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Synthetic SHL-style catalogs (400, 10k, 100k assessments) shaped like scraper.py output.
+"""
+import random
+
+SKILLS = [
+    "Core Java", "Python", "SQL", "JavaScript", "C#", ".NET", "React", "Angular", "AWS",
+    "Data Science", "Machine Learning", "Excel", "Accounting", "GAAP", "Sales",
+    "Negotiation", "Customer Service", "Project Management", "Agile", "Leadership",
+    "Manual Testing", "Selenium", "Verbal Reasoning", "Numerical Reasoning", "Inductive Reasoning"
+]
+VARIANTS = ["Essentials", "Advanced", "Fundamentals", "Professional", "Simulation", "Interactive"]
+LEVELS = ["Entry Level", "Graduate", "Mid-Professional", "Manager", "Director", "Executive"]
+TEST_TYPES = [
+    "Ability & Aptitude", "Biodata & Situational Judgement", "Competencies", "Development & 360",
+    "Assessment Exercises", "Knowledge & Skills", "Personality & Behavior", "Simulations"
+]
+LANGUAGES = ["English (USA)", "English International", "French", "German", "Spanish", "Chinese Simplified"]
+
+def generate_catalog(size, seed=42):
+    """Returns `size` (doc_id, assessment) pairs with unique names and ids"""
+    rng = random.Random(seed)
+    catalog = []
+    for i in range(size):
+        skill = rng.choice(SKILLS)
+        variant = rng.choice(VARIANTS)
+        level = rng.choice(LEVELS)
+        name = f"{skill} {variant} {i} ({level})"
+        test_types = rng.sample(TEST_TYPES, rng.randint(1, 3))
+        description = (
+            f"Multi-choice test that measures {skill.lower()} {variant.lower()} knowledge "
+            f"for {level.lower()} candidates, covering {', '.join(rng.sample(SKILLS, 3)).lower()}."
+        )
+        catalog.append((f"synthetic_{i:06d}", {
+            "url": f"https://www.shl.com/products/product-catalog/view/synthetic-{i}/",
+            "name": name,
+            "description": description,
+            "job_levels": rng.sample(LEVELS, rng.randint(1, 3)),
+            "languages": rng.sample(LANGUAGES, rng.randint(1, 3)),
+            "duration": rng.choice([None, 5, 10, 15, 20, 30, 45, 60]),
+            "test_type": test_types,
+            "remote_support": rng.choice(["Yes", "Yes", "No"]),
+            "adaptive_support": rng.choice(["Yes", "No", "No"])
+        }))
+    return catalog
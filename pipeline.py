@@ -0,0 +1,177 @@
+import argparse
+import queue
+import threading
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scraper import setup_driver, iter_catalog_links, parse_assessment_page, save_assessment
+from vector_engine import upsert_assessments, collection, CHROMA_HOST
+
+# Bounded queues give backpressure: a fast stage blocks instead of piling up work
+LINK_QUEUE_SIZE = 50
+ITEM_QUEUE_SIZE = 64
+DEFAULT_PARSERS = 2
+DEFAULT_BATCH_SIZE = 32
+FLUSH_INTERVAL = 5.0  # Seconds before a partial batch is upserted anyway
+
+_DONE = object()  # Sentinel marking the end of a stage's output
+PUT_TIMEOUT = 1.0  # Seconds between checks of the stop event while a queue is full
+
+def put_unless_stopped(target_queue, item, stop):
+    """Blocking put that gives up once `stop` is set; returns False if it gave up"""
+    while not stop.is_set():
+        try:
+            target_queue.put(item, timeout=PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def crawl_stage(link_queue, num_parsers, stats, stop):
+    """Stage 1: push catalog links downstream as each page is scraped"""
+    driver = None
+    try:
+        driver = setup_driver()
+        wait = WebDriverWait(driver, 20)
+        for link in iter_catalog_links(driver, wait):
+            if not put_unless_stopped(link_queue, link, stop):
+                print("[crawl] No parsers left. Stopping crawl.")
+                break
+            stats['links'] += 1
+    except Exception as e:
+        print(f"[crawl] Fatal error: {e}")
+    finally:
+        if driver is not None:
+            driver.quit()
+        # One sentinel per parser so every worker shuts down
+        for _ in range(num_parsers):
+            put_unless_stopped(link_queue, _DONE, stop)
+
+def parse_stage(worker_id, link_queue, item_queue, stats, lock, stop):
+    """Stage 2: parse assessment pages and hand the results to the embedder"""
+    driver = None
+    try:
+        driver = setup_driver()
+        wait = WebDriverWait(driver, 20)
+        while True:
+            link = link_queue.get()
+            if link is _DONE:
+                break
+
+            print(f"[parser {worker_id}] Processing: {link}")
+            assessment_data = parse_assessment_page(driver, wait, link)
+
+            if assessment_data:
+                try:
+                    doc_id = save_assessment(assessment_data)
+                except Exception as e:
+                    print(f"[parser {worker_id}] Could not save {link}: {e}")
+                    with lock:
+                        stats['failed'] += 1
+                    continue
+                item_queue.put((doc_id, assessment_data))
+                with lock:
+                    stats['parsed'] += 1
+            else:
+                print(f"[parser {worker_id}] ✗ Failed to parse {link}")
+                with lock:
+                    stats['failed'] += 1
+
+            # Small delay to be respectful
+            time.sleep(0.5)
+    except Exception as e:
+        print(f"[parser {worker_id}] Fatal error: {e}")
+    finally:
+        if driver is not None:
+            driver.quit()
+        with lock:
+            stats['live_parsers'] -= 1
+            # Last parser out tells the crawler nobody is consuming links
+            if stats['live_parsers'] == 0:
+                stop.set()
+        item_queue.put(_DONE)
+
+def embed_stage(item_queue, num_parsers, batch_size, stats):
+    """Stage 3: embed and upsert parsed assessments in batches as they arrive"""
+    batch = []
+    finished = 0
+    last_flush = time.time()
+
+    def flush():
+        nonlocal batch, last_flush
+        if batch:
+            try:
+                # Malformed items are skipped, so count what was actually upserted
+                upserted = upsert_assessments(batch)
+                stats['indexed'] += upserted
+                print(f"[embed] Upserted {upserted}/{len(batch)} assessments. Indexed: {stats['indexed']}")
+            except Exception as e:
+                print(f"[embed] Error upserting batch of {len(batch)}: {e}")
+        batch = []
+        last_flush = time.time()
+
+    while finished < num_parsers:
+        try:
+            entry = item_queue.get(timeout=FLUSH_INTERVAL)
+        except queue.Empty:
+            flush()
+            continue
+
+        if entry is _DONE:
+            finished += 1
+        else:
+            batch.append(entry)
+
+        # Flush full batches, and partial ones when the crawl is slow,
+        # so readers on a shared Chroma server see results while scraping continues
+        if len(batch) >= batch_size or time.time() - last_flush >= FLUSH_INTERVAL:
+            flush()
+
+    flush()
+
+def run_pipeline(num_parsers=DEFAULT_PARSERS, batch_size=DEFAULT_BATCH_SIZE):
+    """Crawl, parse and index the catalog with all three stages running concurrently"""
+    if not CHROMA_HOST:
+        print("Note: writing to an embedded Chroma store. A running api.py or app.py only sees "
+              "new vectors after a restart; set CHROMA_HOST to share a Chroma server instead.")
+    link_queue = queue.Queue(maxsize=LINK_QUEUE_SIZE)
+    item_queue = queue.Queue(maxsize=ITEM_QUEUE_SIZE)
+    stats = {'links': 0, 'parsed': 0, 'failed': 0, 'indexed': 0, 'live_parsers': num_parsers}
+    lock = threading.Lock()
+    stop = threading.Event()
+    start = time.time()
+
+    threads = [threading.Thread(target=crawl_stage, args=(link_queue, num_parsers, stats, stop), daemon=True)]
+    for worker_id in range(1, num_parsers + 1):
+        threads.append(threading.Thread(
+            target=parse_stage,
+            args=(worker_id, link_queue, item_queue, stats, lock, stop),
+            daemon=True
+        ))
+
+    for thread in threads:
+        thread.start()
+
+    # The embedder runs on the main thread and returns once every parser is done
+    embed_stage(item_queue, num_parsers, batch_size, stats)
+
+    for thread in threads:
+        thread.join()
+
+    print(f"\n{'='*60}")
+    print(f"PIPELINE COMPLETE in {time.time() - start:.1f}s")
+    print(f"{'='*60}")
+    print(f"Total links found: {stats['links']}")
+    print(f"Successfully parsed: {stats['parsed']}")
+    print(f"Failed: {stats['failed']}")
+    print(f"Indexed: {stats['indexed']} (collection size: {collection.count()})")
+
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming scrape-to-index pipeline")
+    parser.add_argument("--parsers", type=int, default=DEFAULT_PARSERS, help="Number of parallel page parsers (one browser each)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Assessments per embedding/upsert batch")
+    args = parser.parse_args()
+
+    run_pipeline(num_parsers=args.parsers, batch_size=args.batch_size)
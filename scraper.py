@@ -138,8 +138,8 @@ def check_adaptive_support(soup, page_text):
     
     return "No"
 
-def scrape_catalog_links(driver, wait):
-    """Scrape all Individual Test Solution links from catalog pages"""
+def iter_catalog_links(driver, wait):
+    """Yield Individual Test Solution links as each catalog page is scraped"""
     print(f"Starting scrape of {BASE_URL}...")
     
     all_product_links = set()
@@ -170,6 +170,7 @@ def scrape_catalog_links(driver, wait):
             elements = driver.find_elements(By.TAG_NAME, "a")
             
             links_before = len(all_product_links)
+            page_links = []
             
             for elem in elements:
                 try:
@@ -178,10 +179,15 @@ def scrape_catalog_links(driver, wait):
                         # Filter out pre-packaged solutions
                         # Pre-packaged solutions typically have "solution" or "job-focused" in URL
                         if "solution" not in href.lower() and "job-focused-assessment" not in href.lower():
-                            all_product_links.add(href)
+                            if href not in all_product_links:
+                                all_product_links.add(href)
+                                page_links.append(href)
                 except:
                     continue
             
+            # Hand this page's links downstream before paginating
+            yield from page_links
+            
             new_links = len(all_product_links) - links_before
             print(f"Found {new_links} new links. Total: {len(all_product_links)}")
             
@@ -225,11 +231,22 @@ def scrape_catalog_links(driver, wait):
         print(f"TOTAL LINKS COLLECTED: {len(all_product_links)}")
         print(f"{'='*60}\n")
         
-        return list(all_product_links)
-        
     except Exception as e:
         print(f"Error during catalog scraping: {e}")
-        return list(all_product_links)
+
+def scrape_catalog_links(driver, wait):
+    """Scrape all Individual Test Solution links from catalog pages"""
+    return list(iter_catalog_links(driver, wait))
+
+def save_assessment(assessment_data):
+    """Save parsed assessment to the raw JSON folder and return its document id"""
+    safe_name = sanitize_filename(assessment_data['name'])
+    file_path = os.path.join(OUTPUT_FOLDER, f"{safe_name}.json")
+    
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(assessment_data, f, indent=4, ensure_ascii=False)
+    
+    return safe_name
 
 def parse_assessment_page(driver, wait, url):
     """Parse individual assessment page and extract all details"""
@@ -350,11 +367,7 @@ def main():
             
             if assessment_data:
                 # Save to JSON file
-                safe_name = sanitize_filename(assessment_data['name'])
-                file_path = os.path.join(OUTPUT_FOLDER, f"{safe_name}.json")
-                
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(assessment_data, f, indent=4, ensure_ascii=False)
+                safe_name = save_assessment(assessment_data)
                 
                 print(f"   ✓ Saved: {safe_name}.json")
                 print(f"     - Test Type: {assessment_data['test_type']}")
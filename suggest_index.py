@@ -0,0 +1,299 @@
+import json
+import re
+import heapq
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+# Words that never make a useful suggestion on their own: fillers and catalog qualifiers
+STOPWORDS = {
+    "new", "and", "the", "for", "of", "to", "in", "with", "a", "an", "on", "level", "test", "assessment",
+    "core", "framework", "essentials", "fundamentals", "programming", "verify", "advanced", "basic",
+    "basics", "intermediate", "professional", "entry", "interactive", "solution", "solutions",
+    "skills", "knowledge", "edition", "version", "report", "short", "form", "global"
+}
+VERSION_PATTERN = re.compile(r'^v?\d+(\.\d+)*[a-z]?$', re.I)  # "4.5", "365", "v2", "8"
+MIN_FUZZY_LENGTH = 3
+FUZZY_WINDOW = 2  # Positions past the first mismatch where a typo is looked for
+MAX_SCAN = 256   # Most keys a lookup scans; busier prefixes get a precomputed top-k
+TOP_K = 50       # Candidates kept per busy prefix (>= the /suggest limit)
+
+def normalize(text):
+    """Lowercases and collapses whitespace so keys compare consistently"""
+    return re.sub(r'\s+', ' ', re.sub(r'[^\w+#.\s]', ' ', text.lower())).strip()
+
+def is_skill_word(word):
+    return len(word) > 1 and word.lower() not in STOPWORDS and not VERSION_PATTERN.match(word)
+
+def extract_skills(name):
+    """
+    Extract skill phrases from an assessment name at ingest time.
+    e.g. "Core Java (Entry Level) (New)" -> ["Java"]
+         "Microsoft Excel 365 - Essentials (New)" -> ["Microsoft Excel 365", "Microsoft", "Excel"]
+    """
+    # Drop qualifiers like "(New)" or "(Entry Level)"
+    base = re.sub(r'\([^)]*\)', '', name).strip()
+    skills = []
+    seen = set()
+
+    def add(skill):
+        if normalize(skill) not in seen:
+            seen.add(normalize(skill))
+            skills.append(skill)
+
+    parts = [p.strip() for p in re.split(r'\s+-\s+|/|,|:|\band\b', base, flags=re.I) if p.strip()]
+    for part in parts:
+        # The whole name is already suggested as the assessment itself
+        if len(parts) > 1 and part.lower() not in STOPWORDS and any(is_skill_word(w) for w in part.split()):
+            add(part)
+        # Individual words let "java" find "Core Java"
+        for word in part.split():
+            if is_skill_word(word):
+                add(word)
+    return skills
+
+def merge_sorted(keys, new_keys):
+    """
+    Merges a few sorted new keys into a large sorted list. Slices are copied in C,
+    so this avoids re-sorting (and re-comparing) every existing key.
+    """
+    merged = []
+    start = 0
+    for key in new_keys:
+        position = bisect_left(keys, key, start)
+        merged.extend(keys[start:position])
+        merged.append(key)
+        start = position
+    merged.extend(keys[start:])
+    return merged
+
+class SuggestIndex:
+    """
+    In-memory prefix index over assessment names, test types and skills.
+    Keys are kept in a sorted list so a prefix lookup is a single bisect; prefixes
+    matching more than MAX_SCAN keys answer from a top-k precomputed at build time.
+    """
+    def __init__(self):
+        self.entries = []      # (text, kind, url)
+        self._norms = []       # Normalized text per entry
+        self.keys = []         # Sorted (normalized key, entry id)
+        self.popularity = Counter()
+        self._entry_ids = {}
+        self._top = {}         # Busy prefix -> candidate entry ids
+        self._indexed_ids = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._indexed_ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._indexed_ids
+
+    def _add_entry(self, text, kind, url=None):
+        norm = normalize(text)
+        key = (norm, kind)
+        if key in self._entry_ids:
+            entry_id = self._entry_ids[key]
+        else:
+            entry_id = len(self.entries)
+            self._entry_ids[key] = entry_id
+            self.entries.append((text, kind, url))
+            self._norms.append(norm)
+        # Base popularity: how many assessments share this name/type/skill
+        self.popularity[entry_id] += 1
+        return entry_id
+
+    def build(self, metadatas, ids=None):
+        """Builds the index from stored Chroma metadata"""
+        return self.add(metadatas, ids)
+
+    def add(self, metadatas, ids=None):
+        """
+        Indexes new assessments; ids already indexed are skipped so this is safe
+        to call with the full collection or from an upsert hook.
+        """
+        with self._lock:
+            first_new = len(self.entries)
+            for position, item in enumerate(metadatas):
+                doc_id = ids[position] if ids else item.get('url', item['name'])
+                if doc_id in self._indexed_ids:
+                    continue
+                self._indexed_ids.add(doc_id)
+
+                name = item['name']
+                self._add_entry(name, "assessment", item.get('url'))
+
+                test_types = item.get('test_type', [])
+                if isinstance(test_types, str):
+                    test_types = json.loads(test_types)
+                for t_type in test_types:
+                    self._add_entry(t_type, "test_type")
+
+                skills = item.get('skills')
+                skills = json.loads(skills) if skills else extract_skills(name)
+                for skill in skills:
+                    self._add_entry(skill, "skill")
+
+            new_keys = set()
+            for entry_id in range(first_new, len(self.entries)):
+                words = self._norms[entry_id].split()
+                # Index every word suffix so mid-name words are matched by prefix
+                for i in range(len(words)):
+                    new_keys.add((' '.join(words[i:]), entry_id))
+
+            # Swap in fresh structures so concurrent lookups never see a half-built index
+            if not new_keys:
+                return self
+            keys = merge_sorted(self.keys, sorted(new_keys))
+            if self.keys:
+                top = self._update_top(keys, new_keys)
+            else:
+                top = self._precompute_top(keys)
+            self.keys, self._top = keys, top
+        return self
+
+    def _rank(self, entry_id):
+        return (self.popularity[entry_id], -entry_id)
+
+    def _precompute_top(self, keys):
+        """Top-k candidates for every prefix matching more than MAX_SCAN keys"""
+        top = {}
+        # Snapshot ranks once; calling _rank per key dominates build time on large catalogs
+        ranks = [self._rank(entry_id) for entry_id in range(len(self.entries))]
+        pending = [(0, len(keys), 0)]  # Key range sharing a prefix of length `depth`
+        while pending:
+            lo, hi, depth = pending.pop()
+            i = lo
+            while i < hi:
+                key = keys[i][0]
+                if len(key) <= depth:
+                    i += 1
+                    continue
+                prefix = key[:depth + 1]
+                j = bisect_left(keys, (prefix + '\uffff',), i, hi)
+                if j - i > MAX_SCAN:
+                    ids = {keys[k][1] for k in range(i, j)}
+                    top[prefix] = heapq.nlargest(TOP_K, ids, key=ranks.__getitem__)
+                    pending.append((i, j, depth + 1))
+                i = j
+        return top
+
+    def _update_top(self, keys, new_keys):
+        """Refreshes only the busy prefixes that the newly added keys fall under"""
+        top = dict(self._top)
+        touched = {}
+        for key, entry_id in new_keys:
+            for length in range(1, len(key) + 1):
+                prefix = key[:length]
+                if prefix in top:
+                    touched.setdefault(prefix, set()).add(entry_id)
+                    continue
+                lo = bisect_left(keys, (prefix,))
+                hi = bisect_left(keys, (prefix + '\uffff',), lo)
+                if hi - lo <= MAX_SCAN:
+                    break  # Longer prefixes match even fewer keys
+                # Prefix just became busy
+                top[prefix] = heapq.nlargest(TOP_K, {keys[k][1] for k in range(lo, hi)}, key=self._rank)
+        for prefix, ids in touched.items():
+            candidates = top[prefix]
+            # New entries that can't beat the weakest candidate leave a full list unchanged
+            if len(candidates) >= TOP_K and max(map(self._rank, ids)) < self._rank(candidates[-1]):
+                continue
+            top[prefix] = heapq.nlargest(TOP_K, set(candidates) | ids, key=self._rank)
+        return top
+
+    def _prefix_ids(self, prefix):
+        # Busy prefixes use the precomputed candidates; the rest scan at most MAX_SCAN keys
+        if prefix in self._top:
+            return set(self._top[prefix])
+        keys = self.keys
+        ids = set()
+        i = bisect_left(keys, (prefix,))
+        while i < len(keys) and keys[i][0].startswith(prefix):
+            ids.add(keys[i][1])
+            i += 1
+        return ids
+
+    def _matched_length(self, prefix):
+        """Length of the longest leading part of `prefix` that some key starts with"""
+        keys = self.keys
+        lo, hi = 0, len(prefix)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            i = bisect_left(keys, (prefix[:mid],))
+            if i < len(keys) and keys[i][0].startswith(prefix[:mid]):
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def _next_chars(self, left):
+        """Distinct characters that follow `left` in some key (one bisect per character)"""
+        keys = self.keys
+        chars = []
+        i = bisect_left(keys, (left,))
+        while i < len(keys) and keys[i][0].startswith(left):
+            key = keys[i][0]
+            if len(key) > len(left):
+                chars.append(key[len(left)])
+                i = bisect_left(keys, (left + key[len(left)] + '\uffff',), i)
+            else:
+                i += 1
+        return chars
+
+    def _fuzzy_variants(self, prefix):
+        """
+        Strings one edit away from the prefix (delete, transpose, replace, insert).
+        Edits are only tried in a FUZZY_WINDOW around the first character no key
+        agrees with (never on the first character), and replace/insert only use characters some key continues with,
+        so the cost doesn't grow with the length of the query.
+        """
+        start = self._matched_length(prefix)
+        # The first character is trusted; fanning out over every possible first letter is the costly case
+        positions = range(max(1, start - 1), min(len(prefix), start + FUZZY_WINDOW) + 1)
+        variants = set()
+        for i in positions:
+            left, right = prefix[:i], prefix[i:]
+            chars = self._next_chars(left)
+            if right:
+                variants.add(left + right[1:])
+                for c in chars:
+                    variants.add(left + c + right[1:])
+            if len(right) > 1:
+                variants.add(left + right[1] + right[0] + right[2:])
+            for c in chars:
+                variants.add(left + c + right)
+        variants.discard(prefix)
+        return variants
+
+    def record_hit(self, name):
+        """Boosts an assessment that was returned to a user (busy prefixes re-rank their precomputed candidates)"""
+        entry_id = self._entry_ids.get((normalize(name), "assessment"))
+        if entry_id is not None:
+            self.popularity[entry_id] += 1
+
+    def suggest(self, query, limit=8):
+        """Returns up to `limit` suggestions ranked by popularity, falling back to one-typo matches"""
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        exact = self._prefix_ids(prefix)
+        fuzzy = set()
+        # Only pay for typo tolerance when nothing matches the prefix exactly
+        if not exact and len(prefix) >= MIN_FUZZY_LENGTH:
+            for variant in self._fuzzy_variants(prefix):
+                fuzzy |= self._prefix_ids(variant)
+
+        suggestions = []
+        seen = set()
+        for entry_id in sorted(exact or fuzzy, key=self._rank, reverse=True):
+            text, kind, url = self.entries[entry_id]
+            # One suggestion per text, even if it is both an assessment and a skill
+            if self._norms[entry_id] in seen:
+                continue
+            seen.add(self._norms[entry_id])
+            suggestions.append({"text": text, "type": kind, "url": url})
+            if len(suggestions) == limit:
+                break
+        return suggestions
@@ -1,35 +1,109 @@
 import os
 import json
 import glob
+import threading
+from collections import Counter
 import google.generativeai as genai
 import chromadb
 from chromadb import Documents, EmbeddingFunction, Embeddings
 from dotenv import load_dotenv
+from suggest_index import extract_skills
 
 load_dotenv()
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-genai.configure(api_key=GOOGLE_API_KEY)
+# Optional override, e.g. http://127.0.0.1:8765 for the benchmark stand-in server
+GEMINI_API_ENDPOINT = os.getenv('GEMINI_API_ENDPOINT')
+if GEMINI_API_ENDPOINT:
+    genai.configure(api_key=GOOGLE_API_KEY, transport="rest", client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+else:
+    genai.configure(api_key=GOOGLE_API_KEY)
 
 DATA_FOLDER = "data/assessments_raw"
+CHROMA_PATH = os.getenv('CHROMA_PATH', "data/chroma_db")
+# Set CHROMA_HOST to share one Chroma server (`chroma run --path data/chroma_db --port 8001`)
+# between processes; embedded clients don't see vectors another process upserts
+CHROMA_HOST = os.getenv('CHROMA_HOST')
+CHROMA_PORT = int(os.getenv('CHROMA_PORT', 8001))
 COLLECTION_NAME = "shl_assessments"
 
+# Callables run as listener(metadatas, ids) after every upsert, e.g. the /suggest index
+upsert_listeners = []
+
+# Gemini failures are absorbed (zero vectors, placeholder explanations) so the API keeps
+# answering; they're counted here so degraded results stay visible (see benchmarks/)
+fallback_stats = Counter()
+_fallback_lock = threading.Lock()
+
+def record_fallback(kind, count=1):
+    with _fallback_lock:
+        fallback_stats[kind] += count
+
 class GeminiEmbeddingFunction(EmbeddingFunction):
     def __init__(self):
         self.model_name = 'models/text-embedding-004'
     def __call__(self, input: Documents) -> Embeddings:
+        # Embed the whole batch in one request; fall back to one call per text
+        if len(input) > 1:
+            try:
+                response = genai.embed_content(model=self.model_name, content=list(input), task_type="retrieval_document")
+                return response['embedding']
+            except Exception:
+                pass
         embeddings = []
         for text in input:
             try:
                 response = genai.embed_content(model=self.model_name, content=text, task_type="retrieval_document")
                 embeddings.append(response['embedding'])
             except Exception as e:
+                record_fallback("zero_embeddings")
                 embeddings.append([0] * 768) 
         return embeddings
 
-chroma_client = chromadb.PersistentClient(path="data/chroma_db")
+if CHROMA_HOST:
+    chroma_client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+else:
+    chroma_client = chromadb.PersistentClient(path=CHROMA_PATH)
 embedding_function = GeminiEmbeddingFunction()
 collection = chroma_client.get_or_create_collection(name=COLLECTION_NAME, embedding_function=embedding_function)
 
+def build_document(item):
+    """Returns the search text and Chroma metadata for one assessment"""
+    # Create a rich text representation for search
+    text_content = f"Name: {item['name']}. Type: {', '.join(item['test_type'])}. Description: {item['description']}"
+    metadata = {
+        "url": item['url'],
+        "name": item['name'],
+        "adaptive_support": item['adaptive_support'],
+        "description": item['description'],
+        "duration": item['duration'] if item['duration'] else 0,
+        "remote_support": item['remote_support'],
+        "test_type": json.dumps(item['test_type']),
+        # Skill phrases feed the /suggest prefix index
+        "skills": json.dumps(extract_skills(item['name']))
+    }
+    return text_content, metadata
+
+def upsert_assessments(batch):
+    """Embeds and upserts a batch of (doc_id, item) pairs in a single call"""
+    # Chroma rejects a whole upsert with repeated ids, so the last item per id wins,
+    # as it did when files were upserted one at a time
+    documents_by_id = {}
+    for doc_id, item in batch:
+        # Skip malformed items so one bad page can't drop the whole batch
+        try:
+            documents_by_id[doc_id] = build_document(item)
+        except Exception as e:
+            print(f"Skipping {doc_id}: malformed assessment ({e!r})")
+
+    ids = list(documents_by_id)
+    documents = [documents_by_id[doc_id][0] for doc_id in ids]
+    metadatas = [documents_by_id[doc_id][1] for doc_id in ids]
+    if ids:
+        collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+        for listener in upsert_listeners:
+            listener(metadatas, ids)
+    return len(ids)
+
 def ingest_data():
     json_files = glob.glob(os.path.join(DATA_FOLDER, "*.json"))
     print(f"Found {len(json_files)} files. Starting ingestion...")
@@ -40,46 +114,44 @@ def ingest_data():
                 item = json.load(f)
             
             doc_id = os.path.basename(file_path).replace(".json", "")
-            # Create a rich text representation for search
-            text_content = f"Name: {item['name']}. Type: {', '.join(item['test_type'])}. Description: {item['description']}"
-            
-            collection.upsert(
-                ids=[doc_id],
-                documents=[text_content],
-                metadatas=[{
-                    "url": item['url'],
-                    "name": item['name'],
-                    "adaptive_support": item['adaptive_support'],
-                    "description": item['description'],
-                    "duration": item['duration'] if item['duration'] else 0,
-                    "remote_support": item['remote_support'],
-                    "test_type": json.dumps(item['test_type'])
-                }]
-            )
+            upsert_assessments([(doc_id, item)])
         except Exception as e:
             print(f"Error ingesting {file_path}: {e}")
 
     print("Ingestion complete.")
 
-def get_recommendations(query, n_results=5):
-    """
-    Returns a natural language explanation (for Streamlit UI)
-    and retrieved metadata.
-    """
-    print(f"\nSearching for: '{query}'")
-    
-    # 1. Query the vector database
+def format_assessment(item):
+    """Converts stored Chroma metadata back into the API's assessment shape"""
+    # Convert the stored JSON string back into a Python List
+    t_type = json.loads(item['test_type']) if isinstance(item['test_type'], str) else item['test_type']
+    return {
+        "url": item['url'],
+        "name": item['name'],
+        "adaptive_support": item['adaptive_support'],
+        "description": item['description'],
+        "duration": int(item['duration']),
+        "remote_support": item['remote_support'],
+        "test_type": t_type
+    }
+
+def retrieve_assessments(query, n_results=10):
+    """Vector search only: returns formatted assessments without any LLM call"""
     results = collection.query(
         query_texts=[query],
         n_results=n_results
     )
 
     if not results['metadatas'] or not results['metadatas'][0]:
+        return []
+
+    return [format_assessment(item) for item in results['metadatas'][0]]
+
+def explain_recommendations(query, retrieved_items):
+    """Asks Gemini why the retrieved assessments match the query"""
+    if not retrieved_items:
         return "No relevant assessments found."
 
-    retrieved_items = results['metadatas'][0]
-    
-    # 2. Build context for the LLM
+    # Build context for the LLM
     # We include duration and name to give the AI enough info to explain its choice
     context_text = "\n".join([f"- {item['name']} (Duration: {item['duration']} mins)" for item in retrieved_items])
 
@@ -95,7 +167,7 @@ def get_recommendations(query, n_results=5):
 
     ai_response = "AI explanation currently unavailable."
 
-    # 3. Smart Model Selector (PDF Requirement: Modern LLM-based techniques)
+    # Smart Model Selector (PDF Requirement: Modern LLM-based techniques)
     # Using the models verified in your environment earlier
     model_candidates = [
         'models/gemini-2.5-flash', 
@@ -112,8 +184,23 @@ def get_recommendations(query, n_results=5):
             break 
         except Exception:
             continue 
+    else:
+        record_fallback("unavailable_explanations")
     
     return ai_response
 
+def get_recommendations(query, n_results=5):
+    """
+    Returns a natural language explanation (for Streamlit UI)
+    and retrieved metadata.
+    """
+    print(f"\nSearching for: '{query}'")
+    
+    # 1. Query the vector database
+    retrieved_items = retrieve_assessments(query, n_results=n_results)
+
+    # 2. Explain the matches with the LLM
+    return explain_recommendations(query, retrieved_items)
+
 if __name__ == "__main__":
     ingest_data()
\ No newline at end of file